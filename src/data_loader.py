@@ -1,56 +1,263 @@
 """
 Data loading and preprocessing for Titanic survival prediction.
 """
+import itertools
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
+from sklearn.linear_model import BayesianRidge
+
+from features import engineer_all_features
+
+# Category order defines the integer code each value is encoded as
+SEX_CATEGORIES = ['male', 'female']
+EMBARKED_CATEGORIES = ['S', 'C', 'Q']
+
+# Columns the pipeline actually uses (Cabin, Ticket and PassengerId are never loaded)
+LOAD_COLUMNS = ['Survived', 'Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare',
+                'Embarked', 'Name']
+LOAD_DTYPES = {
+    'Pclass': 'int8', 'SibSp': 'int8', 'Parch': 'int8',
+    'Sex': 'category', 'Embarked': 'category',
+    'Fare': 'float32', 'Age': 'float32'
+}
 
+# Model features that fit in narrow dtypes
+INT_FEATURES = ['Pclass', 'Sex', 'SibSp', 'Parch', 'Embarked', 'FamilySize',
+                'IsAlone', 'Title', 'FareBin', 'AgeBin']
+FLOAT_FEATURES = ['Age', 'Fare']
 
-def load_data(file_path='data/titanic.csv'):
+# Columns dropped when a frame was loaded without LOAD_COLUMNS
+UNUSED_COLUMNS = ['Cabin', 'Ticket', 'PassengerId']
+
+
+def load_data(file_path='data/titanic.csv', usecols=None, dtype=None):
     """
     Load the Titanic dataset.
 
     Args:
         file_path: Path to the CSV file
+        usecols: Columns to read (e.g. LOAD_COLUMNS); None reads all columns
+        dtype: Column dtype mapping (e.g. LOAD_DTYPES); None lets pandas infer
 
     Returns:
         pandas.DataFrame: Loaded dataset
     """
-    df = pd.read_csv(file_path)
+    # The pyarrow engine parses blocks of the file on a thread pool
+    df = pd.read_csv(file_path, engine='pyarrow', usecols=usecols, dtype=dtype)
     return df
 
 
-def impute_missing_values(df, include_target=True):
+def load_data_chunks(file_path='data/titanic.csv', chunksize=200_000):
     """
-    Impute missing values using MICE (Multiple Imputation by Chained Equations).
+    Lazily read the Titanic dataset in chunks to bound peak memory.
 
-    Uses scikit-learn's IterativeImputer which models each feature with missing values
-    as a function of other features in a round-robin fashion.
+    Args:
+        file_path: Path to the CSV file
+        chunksize: Number of rows per chunk
+
+    Returns:
+        pandas.io.parsers.TextFileReader: Iterator of DataFrame chunks
+    """
+    return pd.read_csv(file_path, chunksize=chunksize,
+                       usecols=LOAD_COLUMNS, dtype=LOAD_DTYPES)
+
+
+def preprocess_stream(chunks, use_mice_imputation=True):
+    """
+    Preprocess and feature-engineer each chunk, then combine the results.
+
+    Only the processed output of each chunk is kept in memory, so the raw
+    CSV never has to be materialized in full. Imputation is fitted once on
+    the first chunk and applied unchanged to every chunk, so fill values are
+    consistent and small or sparse tail chunks are handled.
 
     Args:
-        df: DataFrame with potential missing values
-        include_target: Whether to include Survived column in imputation model
+        chunks: Iterable of raw DataFrame chunks (e.g. from load_data_chunks)
+        use_mice_imputation: Passed through to preprocess_data
 
     Returns:
-        pandas.DataFrame: DataFrame with imputed values
+        pandas.DataFrame: Preprocessed dataframe with all engineered features
     """
-    df = df.copy()
+    chunks = iter(chunks)
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise ValueError("No chunks to preprocess")
 
-    # Drop columns with too many missing values (Cabin) and non-numeric columns
-    # Keep Name for title extraction later
-    columns_to_drop = ['Cabin', 'Ticket', 'PassengerId']
-    df_impute = df.drop(columns=[col for col in columns_to_drop if col in df.columns])
+    fitted_imputation = fit_imputation(first_chunk, use_mice_imputation=use_mice_imputation)
+    processed = [
+        engineer_all_features(preprocess_data(chunk, use_mice_imputation=use_mice_imputation,
+                                              fitted_imputation=fitted_imputation))
+        for chunk in itertools.chain([first_chunk], chunks)
+    ]
+    return pd.concat(processed)
+
+
+def encode_categorical(series, categories):
+    """
+    Encode a string column as integer category codes.
+
+    Uses pandas' vectorized factorization rather than a per-row dict lookup.
+
+    Args:
+        series: Column to encode
+        categories: Ordered list of known values; position gives the code
+
+    Returns:
+        numpy.ndarray: int8 codes, with -1 for missing or unknown values
+    """
+    return pd.Categorical(series, categories=categories).codes.astype('int8')
+
+
+def select_impute_columns(df, missing_cols, top_k=5):
+    """
+    Pick the columns to feed the imputer: the columns with missing values plus
+    the predictors most correlated with them.
+
+    IterativeImputer cost grows with the number of features, so weakly related
+    columns are left out of the model. Predictors are ranked against the mean of
+    the standardized missing columns, which needs one correlation vector instead
+    of the full correlation matrix.
+
+    Args:
+        df: Numeric DataFrame of candidate columns
+        missing_cols: Columns that contain missing values
+        top_k: Number of predictors to keep
+
+    Returns:
+        list: Column names to pass to the imputer, in frame order
+    """
+    missing = df[missing_cols]
+    target = ((missing - missing.mean()) / missing.std()).mean(axis=1)
+    predictors = df.drop(columns=missing_cols).corrwith(target).abs().dropna()
+
+    selected = set(missing_cols) | set(predictors.nlargest(top_k).index)
+    return [col for col in df.columns if col in selected]
+
+
+def _encode_for_imputation(df):
+    """Drop unused columns and numerically encode a frame for the imputer; returns (frame, Name)."""
+    # Drop columns with too many missing values (Cabin) and non-numeric columns.
+    # A no-op for frames loaded with LOAD_COLUMNS; drop returns a new frame, so
+    # replacing columns below leaves the caller's frame untouched
+    df_impute = df.drop(columns=UNUSED_COLUMNS, errors='ignore')
 
     # Convert categorical variables to numeric before imputation
-    df_impute['Sex'] = df_impute['Sex'].map({'male': 0, 'female': 1})
-    df_impute['Embarked'] = df_impute['Embarked'].map({'S': 0, 'C': 1, 'Q': 2})
+    # Missing/unknown values (code -1) are turned back into NaN so the imputer fills them
+    for col, categories in (('Sex', SEX_CATEGORIES), ('Embarked', EMBARKED_CATEGORIES)):
+        codes = encode_categorical(df_impute[col], categories)
+        df_impute[col] = pd.Series(codes, index=df_impute.index).where(codes >= 0)
 
     # Store Name column separately (can't impute text)
-    name_col = df_impute['Name'].copy() if 'Name' in df_impute.columns else None
+    name_col = df_impute['Name'] if 'Name' in df_impute.columns else None
     df_impute = df_impute.drop('Name', axis=1, errors='ignore')
 
+    return df_impute, name_col
+
+
+def _candidate_impute_columns(df_impute, include_target):
+    """Columns the imputer may model, optionally excluding the Survived target."""
+    if include_target and 'Survived' in df_impute.columns:
+        return df_impute.columns.tolist()
+    return [col for col in df_impute.columns if col != 'Survived']
+
+
+def _make_imputer():
+    """Create the MICE imputer - a lighter Bayesian Ridge that stops early once converged."""
+    return IterativeImputer(
+        estimator=BayesianRidge(max_iter=50),
+        max_iter=5,
+        tol=1e-3,
+        sample_posterior=False,
+        keep_empty_features=True,
+        random_state=42,
+        verbose=0
+    )
+
+
+def fit_mice_imputer(df, include_target=True):
+    """
+    Fit a MICE imputer on a reference frame so it can be applied to other frames.
+
+    Every candidate column is modelled, since frames it is later applied to may
+    be missing values in columns that were complete in the reference frame.
+
+    Args:
+        df: Reference DataFrame (e.g. the first chunk of a stream)
+        include_target: Whether to include Survived column in imputation model
+
+    Returns:
+        IterativeImputer: Fitted imputer
+    """
+    df_impute, _ = _encode_for_imputation(df)
+    impute_cols = _candidate_impute_columns(df_impute, include_target)
+    return _make_imputer().fit(df_impute[impute_cols])
+
+
+def fit_simple_imputation(df):
+    """
+    Compute the fill values used by the simple (legacy) imputation.
+
+    Args:
+        df: Reference DataFrame
+
+    Returns:
+        dict: Median Age and Fare, and the most common Embarked code
+
+    Raises:
+        ValueError: If a column has no observed values to fit on
+    """
+    fill_values = {}
+    for col in ('Age', 'Fare'):
+        values = df[col].to_numpy(dtype=np.float64)
+        if np.isnan(values).all():
+            raise ValueError(f"Cannot impute {col}: no observed values")
+        fill_values[col] = np.nanmedian(values)
+
+    codes = encode_categorical(df['Embarked'], EMBARKED_CATEGORIES)
+    if not (codes >= 0).any():
+        raise ValueError("Cannot impute Embarked: no observed values")
+    fill_values['Embarked'] = np.bincount(codes[codes >= 0]).argmax()
+
+    return fill_values
+
+
+def fit_imputation(df, use_mice_imputation=True):
+    """
+    Fit imputation on a reference frame for reuse via preprocess_data.
+
+    Args:
+        df: Reference DataFrame
+        use_mice_imputation: If True, fit a MICE imputer; if False, simple fill values
+
+    Returns:
+        IterativeImputer or dict: Fitted imputation for preprocess_data
+    """
+    if use_mice_imputation:
+        return fit_mice_imputer(df, include_target=True)
+    return fit_simple_imputation(df)
+
+
+def impute_missing_values(df, include_target=True, imputer=None):
+    """
+    Impute missing values using MICE (Multiple Imputation by Chained Equations).
+
+    Uses scikit-learn's IterativeImputer which models each feature with missing values
+    as a function of other features in a round-robin fashion.
+
+    Args:
+        df: DataFrame with potential missing values
+        include_target: Whether to include Survived column in imputation model
+        imputer: Imputer from fit_mice_imputer to apply; if None, one is fitted on df
+
+    Returns:
+        pandas.DataFrame: DataFrame with imputed values
+    """
+    df_impute, name_col = _encode_for_imputation(df)
+
     # Get columns with missing values
     missing_cols = df_impute.columns[df_impute.isnull().any()].tolist()
 
@@ -60,29 +267,22 @@ def impute_missing_values(df, include_target=True):
         for col in missing_cols:
             print(f"  {col}: {df_impute[col].isnull().sum()}")
 
-        # Determine which columns to use for imputation
-        if include_target and 'Survived' in df_impute.columns:
-            impute_cols = df_impute.columns.tolist()
+        if imputer is None:
+            # Determine which columns to use for imputation
+            candidate_cols = _candidate_impute_columns(df_impute, include_target)
+            impute_cols = select_impute_columns(df_impute[candidate_cols], missing_cols)
+            imputed = _make_imputer().fit_transform(df_impute[impute_cols])
         else:
-            impute_cols = [col for col in df_impute.columns if col != 'Survived']
-
-        # Create imputer - uses Bayesian Ridge regression by default
-        imputer = IterativeImputer(
-            max_iter=10,
-            random_state=42,
-            verbose=0
-        )
-
-        # Fit and transform
-        df_imputed = pd.DataFrame(
-            imputer.fit_transform(df_impute[impute_cols]),
-            columns=impute_cols,
-            index=df_impute.index
-        )
-
-        # Copy back non-imputed columns if Survived was excluded
-        if not include_target and 'Survived' in df_impute.columns:
-            df_imputed['Survived'] = df_impute['Survived']
+            impute_cols = imputer.feature_names_in_.tolist()
+            imputed = imputer.transform(df_impute[impute_cols])
+
+        df_imputed = pd.DataFrame(imputed, columns=impute_cols, index=df_impute.index)
+
+        # Copy back columns that were left out of the imputation model
+        for col in df_impute.columns:
+            if col not in impute_cols:
+                df_imputed[col] = df_impute[col]
+        df_imputed = df_imputed[df_impute.columns]
 
         # Add Name column back
         if name_col is not None:
@@ -97,57 +297,83 @@ def impute_missing_values(df, include_target=True):
     return df_imputed
 
 
-def preprocess_data(df, use_mice_imputation=True):
+def preprocess_data(df, use_mice_imputation=True, fitted_imputation=None):
     """
     Preprocess the Titanic dataset.
 
     Args:
         df: Raw dataframe
         use_mice_imputation: If True, use MICE imputation; if False, use simple median/mode
+        fitted_imputation: Result of fit_imputation to apply instead of fitting on df
 
     Returns:
         pandas.DataFrame: Preprocessed dataframe
     """
-    # Create a copy to avoid modifying original
-    df = df.copy()
-
     if use_mice_imputation:
         # Use MICE (Multiple Imputation by Chained Equations)
         # This models missing values using other features including Survived
-        df = impute_missing_values(df, include_target=True)
+        df = impute_missing_values(df, include_target=True, imputer=fitted_imputation)
     else:
-        # Simple imputation (legacy method)
-        df['Age'] = df['Age'].fillna(df['Age'].median())
-        df['Embarked'] = df['Embarked'].fillna(df['Embarked'].mode()[0])
-        df['Fare'] = df['Fare'].fillna(df['Fare'].median())
+        fill_values = fitted_imputation
+        if fill_values is None:
+            fill_values = fit_simple_imputation(df)
 
-        # Drop Cabin (too many missing values)
+        # Drop Cabin (too many missing values); drop returns a new frame, so
+        # replacing columns below leaves the caller's frame untouched
         df = df.drop('Cabin', axis=1, errors='ignore')
 
+        # Simple imputation (legacy method) - median fill in one masked copy per column
+        for col in ('Age', 'Fare'):
+            values = df[col].to_numpy(dtype=np.float64, copy=True)
+            np.copyto(values, fill_values[col], where=np.isnan(values))
+            df[col] = values
+
         # Convert Sex to numeric
-        df['Sex'] = df['Sex'].map({'male': 0, 'female': 1})
+        df['Sex'] = encode_categorical(df['Sex'], SEX_CATEGORIES)
 
-        # Convert Embarked to numeric
-        df['Embarked'] = df['Embarked'].map({'S': 0, 'C': 1, 'Q': 2})
+        # Convert Embarked to numeric, filling missing/unknown ports with the most common code
+        codes = encode_categorical(df['Embarked'], EMBARKED_CATEGORIES)
+        df['Embarked'] = np.where(codes < 0, fill_values['Embarked'], codes).astype(np.int8)
 
     return df
 
 
-def split_features_target(df, target_column='Survived'):
+def downcast_features(X):
+    """
+    Cast feature columns to int8/float32 to cut memory traffic during training.
+
+    Args:
+        X: Feature DataFrame
+
+    Returns:
+        pandas.DataFrame: Features with narrowed dtypes
+    """
+    int_cols = [col for col in INT_FEATURES if col in X.columns]
+    dtypes = {col: 'int8' for col in int_cols}
+    dtypes.update({col: 'float32' for col in FLOAT_FEATURES if col in X.columns})
+
+    # Round first so MICE-imputed codes land on the nearest category instead of truncating
+    rounded = {col: X[col].round() for col in int_cols if pd.api.types.is_float_dtype(X[col])}
+    return X.assign(**rounded).astype(dtypes)
+
+
+def split_features_target(df, target_column='Survived', feature_columns=None):
     """
     Split dataframe into features and target.
 
     Args:
         df: Preprocessed dataframe
         target_column: Name of the target column
+        feature_columns: Columns to use as features; defaults to the raw numeric columns
 
     Returns:
-        tuple: (X, y) features and target
+        tuple: (X, y) features (downcast to int8/float32) and target
     """
     # Select numeric columns for features
-    feature_columns = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked']
+    if feature_columns is None:
+        feature_columns = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked']
 
-    X = df[feature_columns]
+    X = downcast_features(df[feature_columns])
     y = df[target_column]
 
     return X, y
@@ -156,7 +382,7 @@ def split_features_target(df, target_column='Survived'):
 if __name__ == '__main__':
     # Example usage
     print("Loading Titanic data...")
-    df = load_data()
+    df = load_data(usecols=LOAD_COLUMNS, dtype=LOAD_DTYPES)
     print(f"Loaded {len(df)} rows")
 
     print("\nPreprocessing data with MICE imputation...")
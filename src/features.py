@@ -1,8 +1,21 @@
 """
 Feature engineering for Titanic survival prediction.
 """
-import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from numba import njit, prange
+
+
+def _family_size(sibsp, parch):
+    """Family size including the passenger."""
+    return sibsp + parch + 1
+
+
+def _is_alone(family_size):
+    """1 for passengers travelling alone, else 0."""
+    # Reinterpret the boolean mask as uint8 instead of casting through a copy
+    return (np.asarray(family_size) == 1).view(np.uint8)
 
 
 def create_family_size(df):
@@ -15,9 +28,7 @@ def create_family_size(df):
     Returns:
         pandas.DataFrame: DataFrame with FamilySize column added
     """
-    df = df.copy()
-    df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
-    return df
+    return df.assign(FamilySize=_family_size(df['SibSp'], df['Parch']))
 
 
 def create_is_alone(df):
@@ -30,11 +41,71 @@ def create_is_alone(df):
     Returns:
         pandas.DataFrame: DataFrame with IsAlone column added
     """
-    df = df.copy()
     if 'FamilySize' not in df.columns:
         df = create_family_size(df)
-    df['IsAlone'] = (df['FamilySize'] == 1).astype(int)
-    return df
+    return df.assign(IsAlone=_is_alone(df['FamilySize'].to_numpy()))
+
+
+# Group rare titles
+TITLE_MAPPING = {
+    'Mr': 0, 'Miss': 1, 'Mrs': 2, 'Master': 3, 'Dr': 4,
+    'Rev': 4, 'Col': 4, 'Major': 4, 'Mlle': 1, 'Countess': 2,
+    'Ms': 1, 'Lady': 2, 'Jonkheer': 4, 'Don': 4, 'Dona': 2,
+    'Mme': 2, 'Capt': 4, 'Sir': 4
+}
+
+# Title group per title index; the trailing 0 is picked up by index -1 (unknown title)
+_TITLE_GROUPS = np.array(list(TITLE_MAPPING.values()) + [0], dtype=np.int8)
+_KNOWN_TITLES = pa.array(list(TITLE_MAPPING))
+
+# Fare quartile edges of the Kaggle Titanic training set
+FARE_EDGES = np.array([7.9104, 14.4542, 31.0])
+# Child (0-12], Teen (12-20], Adult (20-40], Middle (40-60], Senior (60+)
+AGE_EDGES = np.array([12.0, 20.0, 40.0, 60.0])
+
+# Frames smaller than this skip the Numba kernel, whose one-off compile or
+# cache load costs far more than the numpy path saves on small data
+NUMBA_MIN_ROWS = 100_000
+
+
+def _extract_title(names):
+    """Map passenger names to grouped title codes (unknown titles become 0)."""
+    # Arrow's RE2-based kernel scans the whole UTF-8 buffer without per-row Python objects
+    names = pa.array(names, type=pa.string(), from_pandas=True)
+    matches = pc.extract_regex(names, pattern=r' (?P<title>[A-Za-z]+)\.')
+    titles = pc.struct_field(matches, 'title')
+    # Title indices point straight into the group table, avoiding a second dict lookup
+    codes = pc.index_in(titles, value_set=_KNOWN_TITLES).fill_null(-1).to_numpy()
+    return _TITLE_GROUPS[codes]
+
+
+def _fill_missing_bins(bins, default):
+    """Replace -1 (missing value) bins with the most common bin, or default if all are missing."""
+    missing = bins < 0
+    if missing.any():
+        observed = bins[~missing]
+        fill = np.bincount(observed).argmax() if len(observed) > 0 else default
+        bins[missing] = fill
+    return bins
+
+
+def _bin_values(values, edges, default):
+    """Bin values with searchsorted, filling missing values with the most common bin."""
+    values = values.to_numpy(dtype=np.float64)
+    # searchsorted would put NaN past the last edge, so mark it as missing instead
+    bins = np.where(np.isnan(values), -1, np.searchsorted(edges, values)).astype(np.int8)
+    return _fill_missing_bins(bins, default)
+
+
+def _bin_fare(fare):
+    """Bin fares into training-set quartiles (0-3); missing fares get the most common bin."""
+    # Bins are right-closed like pd.qcut, which matches searchsorted's default 'left' side
+    return _bin_values(fare, FARE_EDGES, default=0)
+
+
+def _bin_age(age):
+    """Bin ages into life stages (0-4); missing ages get the most common bin."""
+    return _bin_values(age, AGE_EDGES, default=2)
 
 
 def create_title_feature(df):
@@ -47,100 +118,117 @@ def create_title_feature(df):
     Returns:
         pandas.DataFrame: DataFrame with Title column added
     """
-    df = df.copy()
-
     if 'Name' not in df.columns:
         return df
 
-    # Extract title from name (using raw string to avoid escape sequence warning)
-    df['Title'] = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
-
-    # Group rare titles
-    title_mapping = {
-        'Mr': 0, 'Miss': 1, 'Mrs': 2, 'Master': 3, 'Dr': 4,
-        'Rev': 4, 'Col': 4, 'Major': 4, 'Mlle': 1, 'Countess': 2,
-        'Ms': 1, 'Lady': 2, 'Jonkheer': 4, 'Don': 4, 'Dona': 2,
-        'Mme': 2, 'Capt': 4, 'Sir': 4
-    }
-
-    df['Title'] = df['Title'].map(title_mapping)
-    df['Title'] = df['Title'].fillna(0)
-
-    return df
+    return df.assign(Title=_extract_title(df['Name']))
 
 
 def create_fare_bins(df):
     """
     Create fare bins for categorical representation.
 
+    Missing fares are assigned the most common bin.
+
     Args:
         df: DataFrame with Fare column
 
     Returns:
         pandas.DataFrame: DataFrame with FareBin column added
     """
-    df = df.copy()
-
     if 'Fare' not in df.columns:
         return df
 
-    # Create fare bins using quartiles
-    df['FareBin'] = pd.qcut(df['Fare'], 4, labels=False, duplicates='drop')
-    # Fill any NaN values with most common bin
-    df['FareBin'] = df['FareBin'].fillna(df['FareBin'].mode()[0] if len(df['FareBin'].mode()) > 0 else 0)
-
-    return df
+    return df.assign(FareBin=_bin_fare(df['Fare']))
 
 
 def create_age_bins(df):
     """
     Create age bins for categorical representation.
 
+    Missing ages are assigned the most common bin.
+
     Args:
         df: DataFrame with Age column
 
     Returns:
         pandas.DataFrame: DataFrame with AgeBin column added
     """
-    df = df.copy()
-
     if 'Age' not in df.columns:
         return df
 
-    # Create age bins: Child (0-12), Teen (13-20), Adult (21-40), Middle (41-60), Senior (61+)
-    df['AgeBin'] = pd.cut(df['Age'], bins=[0, 12, 20, 40, 60, 100],
-                          labels=[0, 1, 2, 3, 4])
-    # Fill any NaN values with most common bin
-    df['AgeBin'] = df['AgeBin'].fillna(df['AgeBin'].mode()[0] if len(df['AgeBin'].mode()) > 0 else 2)
+    return df.assign(AgeBin=_bin_age(df['Age']))
+
+
+@njit(parallel=True, cache=True)
+def _numeric_features_kernel(sibsp, parch, age, fare, age_edges, fare_edges,
+                             family, is_alone, age_bin, fare_bin):
+    """
+    Fill FamilySize, IsAlone, AgeBin and FareBin in one parallel pass over the rows.
 
-    return df
+    Must stay equivalent to _family_size, _is_alone, _bin_age and _bin_fare.
+    """
+    for i in prange(sibsp.shape[0]):
+        size = sibsp[i] + parch[i] + 1
+        family[i] = size
+        is_alone[i] = size == 1
+        # NaN compares unequal to itself; missing values are marked -1 and filled afterwards
+        age_bin[i] = np.searchsorted(age_edges, age[i]) if age[i] == age[i] else -1
+        fare_bin[i] = np.searchsorted(fare_edges, fare[i]) if fare[i] == fare[i] else -1
 
 
 def engineer_all_features(df):
     """
     Apply all feature engineering steps.
 
+    All new columns are computed from the input arrays and added in a single
+    assign, so the frame is only rebuilt once. Frames of at least
+    NUMBA_MIN_ROWS rows with Age and Fare get their numeric features from a
+    single compiled Numba kernel.
+
     Args:
         df: Raw or preprocessed DataFrame
 
     Returns:
         pandas.DataFrame: DataFrame with all engineered features
     """
-    df = create_family_size(df)
-    df = create_is_alone(df)
-    df = create_title_feature(df)
-    df = create_fare_bins(df)
-    df = create_age_bins(df)
-
-    return df
+    sibsp = df['SibSp'].to_numpy()
+    parch = df['Parch'].to_numpy()
+
+    use_kernel = (len(df) >= NUMBA_MIN_ROWS
+                  and 'Age' in df.columns and 'Fare' in df.columns)
+    if use_kernel:
+        n = len(df)
+        family_size = np.empty(n, dtype=np.result_type(sibsp, parch))
+        is_alone = np.empty(n, dtype=np.uint8)
+        age_bin = np.empty(n, dtype=np.int8)
+        fare_bin = np.empty(n, dtype=np.int8)
+        _numeric_features_kernel(sibsp, parch, df['Age'].to_numpy(), df['Fare'].to_numpy(),
+                                 AGE_EDGES, FARE_EDGES,
+                                 family_size, is_alone, age_bin, fare_bin)
+        new_cols = {'FamilySize': family_size, 'IsAlone': is_alone,
+                    'FareBin': _fill_missing_bins(fare_bin, default=0),
+                    'AgeBin': _fill_missing_bins(age_bin, default=2)}
+    else:
+        family_size = _family_size(sibsp, parch)
+        new_cols = {'FamilySize': family_size, 'IsAlone': _is_alone(family_size)}
+        if 'Fare' in df.columns:
+            new_cols['FareBin'] = _bin_fare(df['Fare'])
+        if 'Age' in df.columns:
+            new_cols['AgeBin'] = _bin_age(df['Age'])
+
+    if 'Name' in df.columns:
+        new_cols['Title'] = _extract_title(df['Name'])
+
+    return df.assign(**new_cols)
 
 
 if __name__ == '__main__':
     # Example usage
-    from data_loader import load_data, preprocess_data
+    from data_loader import load_data, preprocess_data, LOAD_COLUMNS, LOAD_DTYPES
 
     print("Loading and preprocessing data...")
-    df = load_data()
+    df = load_data(usecols=LOAD_COLUMNS, dtype=LOAD_DTYPES)
     df = preprocess_data(df)
 
     print("\nEngineering features...")
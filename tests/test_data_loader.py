@@ -0,0 +1,70 @@
+"""
+Tests for data loading and preprocessing.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import load_data, load_data_chunks, preprocess_data, preprocess_stream
+
+
+@pytest.fixture
+def titanic_csv(tmp_path):
+    """Small Titanic-style CSV whose last row is entirely missing Age and Embarked."""
+    df = pd.DataFrame({
+        'PassengerId': range(1, 11),
+        'Survived': [0, 1, 1, 0, 0, 1, 0, 1, 0, 1],
+        'Pclass': [3, 1, 3, 1, 3, 2, 1, 3, 2, 3],
+        'Name': ['Braund, Mr. Owen', 'Cumings, Mrs. John', 'Heikkinen, Miss. Laina',
+                 'Futrelle, Mrs. Jacques', 'Allen, Mr. William', 'Moran, Mr. James',
+                 'McCarthy, Mr. Timothy', 'Palsson, Master. Gosta', 'Johnson, Mrs. Oscar',
+                 'Nasser, Mrs. Nicholas'],
+        'Sex': ['male', 'female', 'female', 'female', 'male', 'male', 'male', 'male',
+                'female', 'female'],
+        'Age': [22, 38, 26, 35, 35, np.nan, 54, 2, 27, np.nan],
+        'SibSp': [1, 1, 0, 1, 0, 0, 0, 3, 0, 1],
+        'Parch': [0, 0, 0, 0, 0, 0, 0, 1, 2, 0],
+        'Ticket': ['A/5 21171', 'PC 17599', 'STON/O2.', '113803', '373450', '330877',
+                   '17463', '349909', '347742', '237736'],
+        'Fare': [7.25, 71.28, 7.93, 53.1, 8.05, 8.46, 51.86, 21.08, 11.13, 30.07],
+        'Cabin': [None, 'C85', None, 'C123', None, None, 'E46', None, None, None],
+        'Embarked': ['S', 'C', 'S', 'S', 'S', 'Q', 'S', 'S', 'S', None],
+    })
+    path = tmp_path / 'titanic.csv'
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_preprocess_stream_simple_imputation_uses_first_chunk_values(titanic_csv):
+    df = preprocess_stream(load_data_chunks(titanic_csv, chunksize=9),
+                           use_mice_imputation=False)
+
+    assert len(df) == 10
+    assert df[['Age', 'Fare', 'Embarked']].isnull().sum().sum() == 0
+    # The 1-row tail chunk is filled with statistics of the first chunk
+    tail = df.iloc[-1]
+    assert tail['Age'] == 31.0
+    assert tail['Embarked'] == 0
+    assert tail['AgeBin'] == 2
+
+
+def test_preprocess_stream_mice_handles_all_missing_tail_chunk(titanic_csv):
+    df = preprocess_stream(load_data_chunks(titanic_csv, chunksize=9),
+                           use_mice_imputation=True)
+
+    assert len(df) == 10
+    assert df.drop(columns='Name').isnull().sum().sum() == 0
+
+
+def test_preprocess_data_simple_imputation_accepts_integer_columns(tmp_path):
+    path = tmp_path / 'int.csv'
+    pd.DataFrame({
+        'Survived': [0, 1], 'Pclass': [3, 1], 'Name': ['Braund, Mr. Owen', 'Cumings, Mrs. John'],
+        'Sex': ['male', 'female'], 'Age': [22, 38], 'SibSp': [1, 1], 'Parch': [0, 0],
+        'Fare': [7, 71], 'Embarked': ['S', 'C'],
+    }).to_csv(path, index=False)
+
+    df = preprocess_data(load_data(path), use_mice_imputation=False)
+
+    np.testing.assert_array_equal(df[['Age', 'Fare', 'Embarked']].to_numpy(),
+                                  [[22, 7, 0], [38, 71, 1]])
@@ -0,0 +1,56 @@
+"""
+Tests for feature engineering.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import features
+from features import engineer_all_features
+
+
+@pytest.fixture
+def passengers():
+    """Preprocessed passengers covering every age and fare bin."""
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'SibSp': rng.integers(0, 5, n).astype(np.int8),
+        'Parch': rng.integers(0, 4, n).astype(np.int8),
+        'Age': rng.uniform(0.5, 80, n).astype(np.float32),
+        'Fare': rng.exponential(30, n).astype(np.float32),
+        'Name': ['Braund, Mr. Owen'] * n,
+    })
+
+
+def test_numba_kernel_matches_numpy_path(passengers, monkeypatch):
+    expected = engineer_all_features(passengers)
+    monkeypatch.setattr(features, 'NUMBA_MIN_ROWS', 0)
+    result = engineer_all_features(passengers)
+
+    for col in ['FamilySize', 'IsAlone', 'AgeBin', 'FareBin', 'Title']:
+        np.testing.assert_array_equal(result[col].to_numpy(), expected[col].to_numpy())
+        assert result[col].dtype == expected[col].dtype
+
+
+@pytest.mark.parametrize('min_rows', [100_000, 0], ids=['numpy', 'numba'])
+def test_missing_age_and_fare_get_most_common_bin(min_rows, monkeypatch):
+    monkeypatch.setattr(features, 'NUMBA_MIN_ROWS', min_rows)
+    df = pd.DataFrame({
+        'SibSp': np.zeros(5, dtype=np.int8),
+        'Parch': np.zeros(5, dtype=np.int8),
+        'Age': [30.0, 35.0, 5.0, np.nan, np.nan],
+        'Fare': [8.0, 8.5, 100.0, np.nan, 9.0],
+    })
+
+    result = engineer_all_features(df)
+
+    np.testing.assert_array_equal(result['AgeBin'], [2, 2, 0, 2, 2])
+    np.testing.assert_array_equal(result['FareBin'], [1, 1, 3, 1, 1])
+
+
+def test_all_missing_bins_fall_back_to_defaults():
+    df = pd.DataFrame({'Age': [np.nan, np.nan], 'Fare': [np.nan, np.nan]})
+
+    assert features.create_age_bins(df)['AgeBin'].tolist() == [2, 2]
+    assert features.create_fare_bins(df)['FareBin'].tolist() == [0, 0]
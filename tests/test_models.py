@@ -0,0 +1,42 @@
+"""
+Tests for model training helpers.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from models import stratified_split
+
+
+@pytest.fixture
+def binary_data():
+    """891 rows with the Titanic class balance (549 died, 342 survived)."""
+    y = pd.Series(np.array([0] * 549 + [1] * 342))
+    X = pd.DataFrame({'feature': np.arange(len(y))})
+    return X, y
+
+
+def test_stratified_split_sizes_match_train_test_split(binary_data):
+    X, y = binary_data
+    X_train, X_test, y_train, y_test = stratified_split(X, y, test_size=0.2)
+
+    assert len(X_test) == 179
+    assert len(X_train) == 712
+    assert y_test.sum() == 69
+    assert set(X_train.index).isdisjoint(X_test.index)
+
+
+def test_stratified_split_shuffles_classes(binary_data):
+    X, y = binary_data
+    _, _, y_train, y_test = stratified_split(X, y)
+
+    assert not y_train.is_monotonic_increasing
+    assert not y_test.is_monotonic_increasing
+
+
+def test_stratified_split_rejects_non_binary_target():
+    X = pd.DataFrame({'feature': range(4)})
+    y = pd.Series([0, 1, 2, np.nan])
+
+    with pytest.raises(ValueError):
+        stratified_split(X, y)